@@ -11,11 +11,12 @@ Fixes:
 
 import argparse
 import os
+import queue
 import struct
 import sys
-import threading
 import traceback
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory for imports
@@ -23,9 +24,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Windows-specific imports
 if sys.platform == "win32":
+    import win32api
     import win32pipe
     import win32file
+    import win32event
+    import win32process
     import win32security
+    import winerror
     import pywintypes
 else:
     print("Error: This server is designed for Windows only.")
@@ -35,6 +40,28 @@ else:
 PIPE_NAME = r"\\.\pipe\vibevoice"
 SAMPLE_RATE = 24000
 BUFFER_SIZE = 65536
+_U32 = struct.Struct('<I')  # Length prefixes, markers and error codes
+_REQUEST_TAIL = struct.Struct('<32sI')  # Voice ID + flags following the request text
+ERROR_MSG_SIZE = 256
+_ZERO_MSG = memoryview(bytes(ERROR_MSG_SIZE))
+# Pipe instances (and handler threads). Inference is serialized on the model,
+# so one instance streams while another accepts and parses the next request.
+MAX_PIPE_INSTANCES = 2
+# A session client idle this long between requests gives its instance back, so the
+# SAPI DLL's 30 s WaitNamedPipe never times out behind a parked session
+SESSION_IDLE_TIMEOUT_MS = 10000
+# Same reasoning for a client that connects but never sends its first request header,
+# and for one that never closes its end after the end-of-stream marker
+REQUEST_TIMEOUT_MS = 5000
+DISCONNECT_TIMEOUT_MS = 10000
+# Audio chunks buffered between inference and the pipe writer
+WRITE_QUEUE_SIZE = 8
+# After the first chunk, small chunks are coalesced into pipe writes of at least this size
+COALESCE_BYTES = 16384
+# Trailing silence so SAPI doesn't drop the last buffer
+SILENCE_PAD_MS = 300
+# Leading silence sent before the first generated chunk so SAPI starts its audio queue early
+WARMUP_MS = 20
 
 # Error codes
 ERR_SUCCESS = 0
@@ -43,36 +70,115 @@ ERR_INVALID_VOICE = 2
 ERR_MODEL_ERROR = 3
 ERR_UNKNOWN = 99
 
+# High bit of the text length: payload is UTF-8 instead of UTF-16LE.
+# Older clients (the SAPI DLL) never set it and keep sending UTF-16LE.
+TEXT_LEN_UTF8 = 0x80000000
+
 # Request flags (for future extensibility)
 FLAG_NONE = 0x00000000
 FLAG_NO_SILENCE_PAD = 0x00000001  # Skip silence padding if client handles it
+FLAG_SESSION = 0x00000002         # Client keeps the pipe open and sends another request after EOS
 
 
 # --- FIX FOR CRASH: SafeEvent ---
-class SafeEvent(threading.Event):
+class SafeEvent:
     """
-    A wrapper around threading.Event that can be deepcopied safely.
-    The transformers library tries to deepcopy the generation config, 
+    A minimal stop flag with the threading.Event interface that can be deepcopied safely.
+    The transformers library tries to deepcopy the generation config,
     and if a standard Event is inside, it crashes on the _thread.lock.
-    This class prevents that by returning itself during a copy.
+    The flag has a single writer and a single reader, so a plain bool is enough
+    and every is_set() poll during generation avoids taking a lock.
     """
+    __slots__ = ('_flag',)
+
+    def __init__(self):
+        self._flag = False
+
+    def set(self):
+        self._flag = True
+
+    def clear(self):
+        self._flag = False
+
+    def is_set(self) -> bool:
+        return self._flag
+
+    def wait(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._flag:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
     def __deepcopy__(self, memo):
-        # Return self instead of trying to copy the lock
+        # Return self instead of copying
         return self
-    
+
     def __reduce__(self):
         # Fallback for pickling
         return (SafeEvent, ())
 
 
+def _raise_thread_priority():
+    """Executor initializer: run model.generate above normal priority to reduce jitter."""
+    try:
+        win32process.SetThreadPriority(win32api.GetCurrentThread(),
+                                       win32process.THREAD_PRIORITY_ABOVE_NORMAL)
+    except pywintypes.error as e:
+        print(f"[Warning] Could not raise inference thread priority: {e}")
+
+
+class _PipeInstance:
+    """A server-side pipe instance with its own overlapped connect and I/O state."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.connected = False
+        # Outgoing audio frame: 4-byte length prefix followed by int16 PCM
+        self.pcm_scratch = bytearray(BUFFER_SIZE)
+        # Error frame: marker, error code, NUL-padded message
+        self.err_frame = bytearray(_U32.pack(0xFFFFFFFF) + bytes(4 + ERROR_MSG_SIZE))
+        self.connect_ov = pywintypes.OVERLAPPED()
+        self.connect_ov.hEvent = win32event.CreateEvent(None, True, False, None)
+        self.io_ov = pywintypes.OVERLAPPED()
+        self.io_ov.hEvent = win32event.CreateEvent(None, True, False, None)
+
+    def close(self):
+        for h in (self.handle, self.connect_ov.hEvent, self.io_ov.hEvent):
+            try:
+                win32file.CloseHandle(h)
+            except pywintypes.error:
+                pass
+
+
 class SAPIPipeServer:
-    def __init__(self, model_path: str, device: str = "cuda", inference_steps: int = 5):
+    def __init__(self, model_path: str, device: str = "cuda", inference_steps: int = 5,
+                 max_instances: int = MAX_PIPE_INSTANCES):
         self.model_path = model_path
         self.device = device
         self.inference_steps = inference_steps
+        self.max_instances = max(1, max_instances)
         self.tts_service = None
+        self._voice_index: tuple[tuple[str, str], ...] = ()
+        self._available_voices = ""
         self.running = False
-        self._lock = threading.Lock()
+        # One request streams at a time: the model is not reentrant. The vv-stream
+        # thread prepares inputs and drains decoded audio; model.generate itself runs
+        # on the long-lived, above-normal-priority vv-gpu thread.
+        self._stream_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vv-stream")
+        self._gpu_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="vv-gpu", initializer=_raise_thread_priority
+        )
+        self._stop_event = win32event.CreateEvent(None, True, False, None)
+
+        # Pre-packed protocol frames reused by every request
+        self._eos = _U32.pack(0)
+        silence_len = SAMPLE_RATE * SILENCE_PAD_MS // 1000 * 2
+        warmup_len = SAMPLE_RATE * WARMUP_MS // 1000 * 2
+        self._warmup_frame = _U32.pack(warmup_len) + b'\x00' * warmup_len
+        # Length-prefixed silence chunk followed by the end-of-stream marker
+        self._silence_eos_frame = _U32.pack(silence_len) + b'\x00' * silence_len + self._eos
         
         # Security Attributes for OneCore/Settings App visibility
         self._security_attributes = self._create_low_integrity_security_attributes()
@@ -95,11 +201,20 @@ class SAPIPipeServer:
             print(f"[Warning] Security init failed: {e}")
             return None
 
+    # Newlines (cause cutoffs) and curly quotes, normalized in a single translate pass.
+    # CRLF is folded to LF first so it becomes one space; a lone CR still separates words.
+    _NORM_TABLE = str.maketrans({
+        "\r": " ",
+        "\n": " ",
+        "\u2018": "'",
+        "\u2019": "'",
+        "\u201C": '"',
+        "\u201D": '"',
+    })
+
     def _normalize_text(self, text: str) -> str:
         """Fixes newlines causing cutoffs and adds punctuation."""
-        text = text.strip()
-        text = text.replace("\r\n", " ").replace("\n", " ")
-        text = text.replace("'", "'").replace("'", "'").replace(""", '"').replace(""", '"')
+        text = text.replace("\r\n", "\n").translate(self._NORM_TABLE).strip()
 
         if not text:
             return ""
@@ -118,39 +233,165 @@ class SAPIPipeServer:
             inference_steps=self.inference_steps,
         )
         self.tts_service.load()
+        # (lowercase key, real key) pairs for case-insensitive partial matching
+        self._voice_index = tuple((k.lower(), k) for k in self.tts_service.voice_presets)
+        self._available_voices = ", ".join(self.tts_service.voice_presets)
         print(f"[SAPI Server] Model loaded. Ready.")
 
     def create_pipe(self):
         return win32pipe.CreateNamedPipe(
             PIPE_NAME,
-            win32pipe.PIPE_ACCESS_DUPLEX,
+            win32pipe.PIPE_ACCESS_DUPLEX | win32file.FILE_FLAG_OVERLAPPED,
             win32pipe.PIPE_TYPE_BYTE | win32pipe.PIPE_READMODE_BYTE | win32pipe.PIPE_WAIT,
-            win32pipe.PIPE_UNLIMITED_INSTANCES,
+            self.max_instances,
             BUFFER_SIZE,
             BUFFER_SIZE,
             0,
             self._security_attributes
         )
 
-    def write_audio_chunk(self, pipe, chunk: bytes):
-        length_data = struct.pack('<I', len(chunk))
-        win32file.WriteFile(pipe, length_data)
-        if len(chunk) > 0:
-            win32file.WriteFile(pipe, chunk)
+    def _listen(self, pipe: _PipeInstance):
+        """Start an overlapped ConnectNamedPipe; its event fires when a client arrives."""
+        win32event.ResetEvent(pipe.connect_ov.hEvent)
+        pipe.connected = False
+        try:
+            rc = win32pipe.ConnectNamedPipe(pipe.handle, pipe.connect_ov)
+        except pywintypes.error as e:
+            if e.winerror != winerror.ERROR_NO_DATA:  # Client already came and went
+                raise
+            win32pipe.DisconnectNamedPipe(pipe.handle)
+            rc = win32pipe.ConnectNamedPipe(pipe.handle, pipe.connect_ov)
+        if rc == winerror.ERROR_PIPE_CONNECTED:
+            # Client connected before we started listening; no completion is queued
+            pipe.connected = True
+            win32event.SetEvent(pipe.connect_ov.hEvent)
+
+    def _complete(self, pipe: _PipeInstance, timeout: int = win32event.INFINITE) -> int:
+        """
+        Wait for the overlapped read/write pending on ``pipe.io_ov``. stop() or the
+        timeout aborts the wait: the I/O is cancelled and ERROR_OPERATION_ABORTED is
+        raised, so handler threads never outlive the server waiting on an idle client.
+        """
+        rc = win32event.WaitForMultipleObjects([pipe.io_ov.hEvent, self._stop_event],
+                                               False, timeout)
+        if rc != win32event.WAIT_OBJECT_0:
+            win32file.CancelIo(pipe.handle)
+            try:
+                # The buffer must stay alive until the cancelled I/O has completed
+                win32file.GetOverlappedResult(pipe.handle, pipe.io_ov, True)
+            except pywintypes.error:
+                pass
+            raise pywintypes.error(winerror.ERROR_OPERATION_ABORTED, "WaitForMultipleObjects",
+                                   "Pipe I/O cancelled")
+        return win32file.GetOverlappedResult(pipe.handle, pipe.io_ov, False)
+
+    def _read(self, pipe: _PipeInstance, size: int, timeout: int = win32event.INFINITE) -> bytes:
+        buf = win32file.AllocateReadBuffer(size)
+        win32file.ReadFile(pipe.handle, buf, pipe.io_ov)
+        n = self._complete(pipe, timeout)
+        return bytes(buf[:n])
+
+    def _read_exact(self, pipe: _PipeInstance, size: int) -> bytes:
+        """Read up to ``size`` bytes, continuing after partial reads until EOF."""
+        data = self._read(pipe, size)
+        while len(data) < size:
+            more = self._read(pipe, size - len(data))
+            if not more:
+                break
+            data += more
+        return data
+
+    def _write(self, pipe: _PipeInstance, data):
+        win32file.WriteFile(pipe.handle, data, pipe.io_ov)
+        self._complete(pipe)
+
+    def _wait_for_disconnect(self, pipe: _PipeInstance):
+        """Block until the client closes its end of the pipe (or DISCONNECT_TIMEOUT_MS passes)."""
+        try:
+            while self._read(pipe, 4, DISCONNECT_TIMEOUT_MS):
+                pass
+        except pywintypes.error:
+            pass
 
     def write_end_of_stream(self, pipe):
-        win32file.WriteFile(pipe, struct.pack('<I', 0))
+        self._write(pipe, self._eos)
 
     def write_error(self, pipe, error_code: int, message: str):
         try:
-            win32file.WriteFile(pipe, struct.pack('<I', 0xFFFFFFFF))
-            win32file.WriteFile(pipe, struct.pack('<I', error_code))
-            msg_bytes = message.encode('utf-8')[:255]
-            msg_padded = msg_bytes + b'\x00' * (256 - len(msg_bytes))
-            win32file.WriteFile(pipe, msg_padded)
+            # Marker + code + message filled into the instance's error frame, one write
+            frame = pipe.err_frame
+            msg_bytes = message.encode('utf-8')[:ERROR_MSG_SIZE - 1]
+            n = len(msg_bytes)
+            _U32.pack_into(frame, 4, error_code)
+            frame[8:8 + n] = msg_bytes
+            frame[8 + n:] = _ZERO_MSG[n:]
+            self._write(pipe, frame)
         except:
             pass
 
+    def _generate(self, text: str, voice_key: str | None, stop_event: SafeEvent,
+                  chunks: queue.Queue, write_errors: list) -> int:
+        """Run on the stream thread: queue audio chunks as they are generated, then the None sentinel."""
+        chunk_count = 0
+        try:
+            for audio_chunk in self.tts_service.stream(
+                text=text,
+                voice_key=voice_key,
+                stop_event=stop_event,
+                executor=self._gpu_executor,
+            ):
+                if write_errors:
+                    break  # Client went away, stop generating
+                chunks.put(audio_chunk)
+                chunk_count += 1
+        finally:
+            chunks.put(None)
+        return chunk_count
+
+    def _pipe_writer(self, pipe: _PipeInstance, chunks: queue.Queue, errors: list):
+        """
+        Convert queued audio chunks to PCM and write them to the pipe until the
+        None sentinel arrives. Samples are converted straight into the instance's
+        frame buffer behind a length prefix, so each frame is one WriteFile with
+        no intermediate bytes objects. The first chunk is sent immediately to keep
+        time-to-first-audio low; after that chunks are coalesced into frames of at
+        least COALESCE_BYTES.
+        """
+        frame = pipe.pcm_scratch
+        used = 4  # Length prefix slot, patched before each write
+        first = True
+
+        def flush():
+            nonlocal used
+            _U32.pack_into(frame, 0, used - 4)
+            self._write(pipe, memoryview(frame)[:used])
+            used = 4
+
+        while True:
+            audio_chunk = chunks.get()
+            if audio_chunk is None:
+                break
+            if errors or not audio_chunk.size:
+                continue  # Keep draining so the producer never blocks on a full queue
+
+            try:
+                n = audio_chunk.size * 2
+                if used + n > len(frame):
+                    if used > 4:
+                        flush()
+                    if 4 + n > len(frame):
+                        pipe.pcm_scratch = frame = bytearray(4 + n)
+                used += self.tts_service.chunk_to_pcm16_into(audio_chunk, memoryview(frame)[used:used + n])
+
+                if first or used - 4 >= COALESCE_BYTES:
+                    flush()
+                    first = False
+            except Exception as e:
+                errors.append(e)  # Producer stops; keep draining until the sentinel
+
+        if used > 4 and not errors:
+            flush()
+
     def _resolve_voice(self, voice_id: str) -> tuple[str | None, bool]:
         """
         Resolve voice ID to a valid voice key.
@@ -165,33 +406,50 @@ class SAPIPipeServer:
             return voice_id, True
 
         # Partial match (case-insensitive)
-        for k in self.tts_service.voice_presets:
-            if voice_id.lower() in k.lower():
+        voice_lower = voice_id.lower()
+        for lower_key, k in self._voice_index:
+            if voice_lower in lower_key:
                 return k, True
 
         # No match found
         return None, False
 
     def handle_client(self, pipe):
+        """Serve requests on a connected pipe until the client ends the session."""
+        timeout = REQUEST_TIMEOUT_MS
+        while self.running and self.handle_request(pipe, timeout):
+            timeout = SESSION_IDLE_TIMEOUT_MS
+
+    def handle_request(self, pipe, timeout: int = REQUEST_TIMEOUT_MS) -> bool:
+        """
+        Handle one request. Returns True if the client asked to keep the session open.
+        ``timeout`` bounds the wait for the request header (ms).
+        """
         try:
             # --- READ REQUEST ---
-            hr, data = win32file.ReadFile(pipe, 4)
+            try:
+                data = self._read(pipe, 4, timeout)
+            except pywintypes.error as e:
+                if e.winerror in (winerror.ERROR_BROKEN_PIPE, winerror.ERROR_OPERATION_ABORTED):
+                    return False  # Client closed the pipe, went idle, or stop()
+                raise
             if len(data) < 4:
-                return
-            text_len = struct.unpack('<I', data)[0]
+                return False
+            text_len = int.from_bytes(data, 'little')
+            encoding = 'utf-8' if text_len & TEXT_LEN_UTF8 else 'utf-16-le'
+            text_len &= ~TEXT_LEN_UTF8
             if text_len == 0:
-                self.write_error(pipe, ERR_EMPTY_TEXT, "Empty text length")
-                return
-
-            hr, data = win32file.ReadFile(pipe, text_len)
-            text = data.decode('utf-16-le')
-
-            hr, data = win32file.ReadFile(pipe, 32)
-            voice_id = data.rstrip(b'\x00').decode('ascii', errors='ignore')
-
-            # Read flags (4 bytes) - used for future extensibility
-            hr, data = win32file.ReadFile(pipe, 4)
-            flags = struct.unpack('<I', data)[0] if len(data) >= 4 else FLAG_NONE
+                return self._reply_error(pipe, ERR_EMPTY_TEXT, "Empty text length", 0)
+
+            # Text, 32-byte voice ID and 4-byte flags in one read
+            body_len = text_len + _REQUEST_TAIL.size
+            data = self._read_exact(pipe, body_len)
+            if len(data) < body_len:
+                return False
+            text = data[:text_len].decode(encoding)
+            voice_raw, flags = _REQUEST_TAIL.unpack_from(data, text_len)
+            nul = voice_raw.find(0)
+            voice_id = voice_raw[:nul if nul >= 0 else 32].decode('ascii', errors='ignore')
 
             print(f"[Request] {text[:40]}{'...' if len(text) > 40 else ''} (voice={voice_id}, flags=0x{flags:08X})")
 
@@ -200,51 +458,57 @@ class SAPIPipeServer:
 
             # Check for empty text after normalization
             if not text:
-                self.write_error(pipe, ERR_EMPTY_TEXT, "Text is empty after normalization")
-                return
+                return self._reply_error(pipe, ERR_EMPTY_TEXT, "Text is empty after normalization", flags)
 
-            # Resolve Voice ID (thread-safe read)
-            with self._lock:
-                voice_key, voice_found = self._resolve_voice(voice_id)
+            # Resolve Voice ID (presets are immutable after load, no lock needed)
+            voice_key, voice_found = self._resolve_voice(voice_id)
 
             if not voice_found:
-                available = ", ".join(self.tts_service.voice_presets.keys())
-                self.write_error(pipe, ERR_INVALID_VOICE, f"Voice '{voice_id}' not found. Available: {available}")
-                return
+                return self._reply_error(pipe, ERR_INVALID_VOICE,
+                                         f"Voice '{voice_id}' not found. Available: {self._available_voices}",
+                                         flags)
 
             # USE SAFE EVENT (Fixes the crash)
             stop_event = SafeEvent()
 
-            # --- STREAM (thread-safe) ---
-            chunk_count = 0
-            with self._lock:
-                for audio_chunk in self.tts_service.stream(
-                    text=text,
-                    voice_key=voice_key,
-                    stop_event=stop_event
-                ):
-                    pcm_bytes = self.tts_service.chunk_to_pcm16(audio_chunk)
-                    self.write_audio_chunk(pipe, pcm_bytes)
-                    chunk_count += 1
+            # --- STREAM ---
+            # Inference runs on the stream and GPU threads while this pipe thread converts and
+            # writes audio, so neither waits on the other beyond the bounded queue.
+            chunks = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+            write_errors = []
+            generation = self._stream_executor.submit(
+                self._generate, text, voice_key, stop_event, chunks, write_errors
+            )
+            if not (flags & FLAG_NO_SILENCE_PAD):
+                # Prime SAPI's audio queue while the first chunk is being generated
+                try:
+                    self._write(pipe, self._warmup_frame)
+                except pywintypes.error as e:
+                    write_errors.append(e)
+            self._pipe_writer(pipe, chunks, write_errors)
+            chunk_count = generation.result()
+
+            if write_errors:
+                raise write_errors[0]
 
             # --- FIX FOR CUTOFFS: PAD SILENCE ---
             # SAPI sometimes drops the last buffer. We push 300ms of silence to flush it.
             # Can be disabled via FLAG_NO_SILENCE_PAD if client handles buffering.
             if not (flags & FLAG_NO_SILENCE_PAD):
-                silence_samples = int(SAMPLE_RATE * 0.3)
-                silence_bytes = b'\x00' * (silence_samples * 2)
-                self.write_audio_chunk(pipe, silence_bytes)
+                # Silence and end-of-stream marker share one pre-packed write
+                self._write(pipe, self._silence_eos_frame)
+            else:
+                self.write_end_of_stream(pipe)
 
-            # End Stream
-            self.write_end_of_stream(pipe)
+            print(f"[Done] Sent {chunk_count} chunks.")
 
-            # Force flush to ensure SAPI gets the data before we close
-            try:
-                win32file.FlushFileBuffers(pipe)
-            except pywintypes.error:
-                pass
+            if flags & FLAG_SESSION:
+                return True  # Keep the pipe for the client's next request
 
-            print(f"[Done] Sent {chunk_count} chunks.")
+            # DisconnectNamedPipe discards unread data, so wait for SAPI to read the
+            # stream and close its end instead of blocking in FlushFileBuffers.
+            self._wait_for_disconnect(pipe)
+            return False
 
         except pywintypes.error as e:
             # Pipe errors (client disconnected, etc.) - log but don't write error
@@ -253,46 +517,95 @@ class SAPIPipeServer:
             print(f"[Error] {e}")
             traceback.print_exc()
             try:
-                self.write_error(pipe, ERR_MODEL_ERROR, str(e)[:200])
+                self._reply_error(pipe, ERR_MODEL_ERROR, str(e)[:200], 0)
             except:
                 pass
+        return False
+
+    def _reply_error(self, pipe, error_code: int, message: str, flags: int) -> bool:
+        """
+        Send an error frame and finish the request like a successful one: keep a
+        session open, otherwise let the client read the frame and close its end
+        (DisconnectNamedPipe would discard it unread).
+        """
+        self.write_error(pipe, error_code, message)
+        if flags & FLAG_SESSION:
+            return True
+        self._wait_for_disconnect(pipe)
+        return False
 
     def run(self):
+        # The stop event is never reset: a stop() that arrived earlier (e.g. while the
+        # model was loading) must not be lost
+        if win32event.WaitForSingleObject(self._stop_event, 0) == win32event.WAIT_OBJECT_0:
+            print("[SAPI Server] Stop requested before start, not listening")
+            return
         self.running = True
-        print(f"[SAPI Server] Listening on {PIPE_NAME}")
+        print(f"[SAPI Server] Listening on {PIPE_NAME} ({self.max_instances} instances)")
         print(f"[Info] Features: Thread-safe, Silence Padding, Low Integrity Access")
-        print(f"[Info] Available voices: {', '.join(self.tts_service.voice_presets.keys())}")
-
-        while self.running:
-            try:
-                pipe = self.create_pipe()
-                win32pipe.ConnectNamedPipe(pipe, None)
+        print(f"[Info] Available voices: {self._available_voices}")
 
-                # Handle connection in a thread
-                t = threading.Thread(target=self._handle_safe, args=(pipe,), daemon=True)
-                t.start()
-
-            except pywintypes.error as e:
-                if e.winerror == 232:  # ERROR_NO_DATA - pipe closing
-                    continue
-                print(f"[Server Loop Error] {e}")
-                time.sleep(1)
-            except Exception as e:
-                print(f"[Server Loop Error] {e}")
-                time.sleep(1)
+        # All pipe instances are created up-front and accept clients with overlapped
+        # ConnectNamedPipe; connected instances are handed to a fixed worker pool.
+        instances = [_PipeInstance(self.create_pipe()) for _ in range(self.max_instances)]
+        events = [self._stop_event] + [pipe.connect_ov.hEvent for pipe in instances]
+        try:
+            for pipe in instances:
+                self._listen(pipe)
+
+            with ThreadPoolExecutor(max_workers=self.max_instances,
+                                    thread_name_prefix="vv-pipe") as pool:
+                try:
+                    while self.running:
+                        pipe = None
+                        try:
+                            # Finite timeout so Ctrl+C is still delivered to the main thread
+                            rc = win32event.WaitForMultipleObjects(events, False, 1000)
+                            if rc == win32event.WAIT_TIMEOUT:
+                                continue
+                            index = rc - win32event.WAIT_OBJECT_0
+                            if index == 0:  # stop() was called
+                                break
+
+                            pipe = instances[index - 1]
+                            win32event.ResetEvent(pipe.connect_ov.hEvent)
+                            if not pipe.connected:
+                                win32file.GetOverlappedResult(pipe.handle, pipe.connect_ov, False)
+                            pool.submit(self._handle_safe, pipe)
+
+                        except pywintypes.error as e:
+                            print(f"[Server Loop Error] {e}")
+                            if pipe is None:
+                                time.sleep(1)
+                                continue
+                            try:
+                                win32pipe.DisconnectNamedPipe(pipe.handle)
+                                self._listen(pipe)
+                            except pywintypes.error:
+                                time.sleep(1)
+                finally:
+                    # Wake handlers blocked in pipe I/O before the pool joins them
+                    # (also covers Ctrl+C raised out of the wait above)
+                    self.stop()
+        finally:
+            self.running = False
+            for pipe in instances:
+                pipe.close()
 
-    def _handle_safe(self, pipe):
+    def _handle_safe(self, pipe: _PipeInstance):
         try:
             self.handle_client(pipe)
         finally:
             try:
-                win32pipe.DisconnectNamedPipe(pipe)
-                win32file.CloseHandle(pipe)
-            except:
-                pass
+                win32pipe.DisconnectNamedPipe(pipe.handle)
+                if self.running:
+                    self._listen(pipe)
+            except pywintypes.error as e:
+                print(f"[Pipe Error] Could not re-arm pipe instance: {e}")
 
     def stop(self):
         self.running = False
+        win32event.SetEvent(self._stop_event)
 
 def main():
     parser = argparse.ArgumentParser(description="VibeVoice SAPI Named Pipe Server")
@@ -302,6 +615,8 @@ def main():
                         help="Device to run on (cuda, cpu, mps)")
     parser.add_argument("--inference_steps", type=int, default=5,
                         help="Number of diffusion inference steps (default: 5)")
+    parser.add_argument("--max_instances", type=int, default=MAX_PIPE_INSTANCES,
+                        help=f"Number of pipe instances / handler threads (default: {MAX_PIPE_INSTANCES})")
     args = parser.parse_args()
 
     # Change to directory of script
@@ -310,7 +625,8 @@ def main():
     server = SAPIPipeServer(
         model_path=args.model_path,
         device=args.device,
-        inference_steps=args.inference_steps
+        inference_steps=args.inference_steps,
+        max_instances=args.max_instances,
     )
     try:
         server.load_model()
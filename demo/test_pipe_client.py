@@ -8,9 +8,10 @@ Usage:
 """
 
 import argparse
+import io
 import struct
 import sys
-import wave
+import time
 from pathlib import Path
 
 if sys.platform == "win32":
@@ -24,23 +25,18 @@ else:
 
 PIPE_NAME = r"\\.\pipe\vibevoice"
 SAMPLE_RATE = 24000
+TEXT_LEN_UTF8 = 0x80000000  # High bit of text length: payload is UTF-8
+_U32 = struct.Struct('<I')
 
+# Request flags
+FLAG_NO_SILENCE_PAD = 0x00000001
+FLAG_SESSION = 0x00000002  # Keep the pipe open for another request after this one
 
-def send_tts_request(text: str, voice_id: str = "", flags: int = 0) -> bytes:
-    """
-    Send a TTS request to the pipe server and receive audio data.
-
-    Args:
-        text: Text to synthesize
-        voice_id: Voice preset ID (e.g., "en-Carter_man" or just "Carter")
-        flags: Reserved flags (currently unused)
 
-    Returns:
-        bytes: PCM audio data (16-bit signed, 24kHz, mono)
-    """
-    # Connect to the named pipe
+def connect_pipe():
+    """Open a client handle to the pipe server."""
     try:
-        pipe = win32file.CreateFile(
+        return win32file.CreateFile(
             PIPE_NAME,
             win32file.GENERIC_READ | win32file.GENERIC_WRITE,
             0,  # No sharing
@@ -57,10 +53,29 @@ def send_tts_request(text: str, voice_id: str = "", flags: int = 0) -> bytes:
             )
         raise
 
+
+def send_tts_request(text: str, voice_id: str = "", flags: int = 0, pipe=None) -> bytes:
+    """
+    Send a TTS request to the pipe server and receive audio data.
+
+    Args:
+        text: Text to synthesize
+        voice_id: Voice preset ID (e.g., "en-Carter_man" or just "Carter")
+        flags: Request flags (FLAG_NO_SILENCE_PAD, FLAG_SESSION)
+        pipe: Existing pipe from connect_pipe() for session use; left open.
+            If omitted, a pipe is opened and closed for this request.
+
+    Returns:
+        bytes: PCM audio data (16-bit signed, 24kHz, mono)
+    """
+    own_pipe = pipe is None
+    if own_pipe:
+        pipe = connect_pipe()
+
     try:
-        # Encode text as UTF-16LE
-        text_bytes = text.encode('utf-16-le')
-        text_length = len(text_bytes)
+        # Encode text as UTF-8 (half the bytes of UTF-16LE for ASCII input)
+        text_bytes = text.encode('utf-8')
+        text_length = len(text_bytes) | TEXT_LEN_UTF8
 
         # Prepare voice ID (32 bytes, null-padded ASCII)
         voice_bytes = voice_id.encode('ascii')[:31]
@@ -68,17 +83,17 @@ def send_tts_request(text: str, voice_id: str = "", flags: int = 0) -> bytes:
 
         # Build request
         request = (
-            struct.pack('<I', text_length) +  # Text length
-            text_bytes +                       # Text (UTF-16LE)
+            _U32.pack(text_length) +           # Text length (UTF-8 bit set)
+            text_bytes +                       # Text (UTF-8)
             voice_padded +                     # Voice ID (32 bytes)
-            struct.pack('<I', flags)           # Flags
+            _U32.pack(flags)                   # Flags
         )
 
         # Send request
         win32file.WriteFile(pipe, request)
 
         # Read audio chunks
-        audio_data = bytearray()
+        audio_data = io.BytesIO()
 
         while True:
             # Read chunk length
@@ -86,7 +101,7 @@ def send_tts_request(text: str, voice_id: str = "", flags: int = 0) -> bytes:
             if len(length_bytes) < 4:
                 raise IOError("Failed to read chunk length")
 
-            chunk_length = struct.unpack('<I', length_bytes)[0]
+            chunk_length = int.from_bytes(length_bytes, 'little')
 
             # Check for end of stream
             if chunk_length == 0:
@@ -96,11 +111,12 @@ def send_tts_request(text: str, voice_id: str = "", flags: int = 0) -> bytes:
             if chunk_length == 0xFFFFFFFF:
                 # Read error code
                 result, error_code_bytes = win32file.ReadFile(pipe, 4)
-                error_code = struct.unpack('<I', error_code_bytes)[0]
+                error_code = int.from_bytes(error_code_bytes, 'little')
 
                 # Read error message
                 result, error_msg_bytes = win32file.ReadFile(pipe, 256)
-                error_msg = error_msg_bytes.rstrip(b'\x00').decode('utf-8', errors='ignore')
+                nul = error_msg_bytes.find(0)
+                error_msg = error_msg_bytes[:nul if nul >= 0 else 256].decode('utf-8', errors='ignore')
 
                 raise RuntimeError(f"Server error {error_code}: {error_msg}")
 
@@ -109,21 +125,26 @@ def send_tts_request(text: str, voice_id: str = "", flags: int = 0) -> bytes:
             if len(chunk_data) < chunk_length:
                 raise IOError(f"Failed to read chunk: expected {chunk_length}, got {len(chunk_data)}")
 
-            audio_data.extend(chunk_data)
+            audio_data.write(chunk_data)
 
-        return bytes(audio_data)
+        return audio_data.getvalue()
 
     finally:
-        win32file.CloseHandle(pipe)
+        if own_pipe:
+            win32file.CloseHandle(pipe)
 
 
 def save_wav(audio_data: bytes, output_path: str, sample_rate: int = SAMPLE_RATE):
-    """Save PCM audio data as a WAV file."""
-    with wave.open(output_path, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 16-bit
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio_data)
+    """Save PCM audio data (16-bit mono) as a WAV file."""
+    # Fixed-format 44-byte RIFF header, so no need for the wave module's bookkeeping
+    header = (
+        b'RIFF' + _U32.pack(36 + len(audio_data)) + b'WAVE' +
+        b'fmt ' + struct.pack('<IHHIIHH', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16) +
+        b'data' + _U32.pack(len(audio_data))
+    )
+    with open(output_path, 'wb') as f:
+        f.write(header)
+        f.write(audio_data)
 
 
 def main():
@@ -146,6 +167,12 @@ def main():
         default="pipe_test_output.wav",
         help="Output WAV file path",
     )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Send the request this many times over one pipe connection (session mode)",
+    )
     args = parser.parse_args()
 
     print(f"Connecting to {PIPE_NAME}...")
@@ -153,7 +180,20 @@ def main():
     print(f"Voice: {args.voice}")
 
     try:
-        audio_data = send_tts_request(args.text, args.voice)
+        if args.repeat > 1:
+            pipe = connect_pipe()
+            try:
+                for i in range(args.repeat):
+                    last = i == args.repeat - 1
+                    start = time.perf_counter()
+                    audio_data = send_tts_request(
+                        args.text, args.voice, 0 if last else FLAG_SESSION, pipe=pipe
+                    )
+                    print(f"Request {i + 1}/{args.repeat}: {time.perf_counter() - start:.2f}s")
+            finally:
+                win32file.CloseHandle(pipe)
+        else:
+            audio_data = send_tts_request(args.text, args.voice)
         print(f"Received {len(audio_data)} bytes of audio")
 
         # Calculate duration
@@ -5,6 +5,7 @@ import json
 import os
 import threading
 import traceback
+from concurrent.futures import Executor
 from pathlib import Path
 from queue import Empty, Queue
 from typing import Any, Callable, Dict, Iterator, Optional, Tuple, cast
@@ -244,7 +245,10 @@ class StreamingTTSService:
         voice_key: Optional[str] = None,
         log_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
         stop_event: Optional[threading.Event] = None,
+        executor: Optional[Executor] = None,
     ) -> Iterator[np.ndarray]:
+        # model.generate runs on ``executor`` when given (e.g. a long-lived GPU thread),
+        # otherwise on a new thread per call
         if not text.strip():
             return
         text = text.replace("’", "'")
@@ -274,23 +278,28 @@ class StreamingTTSService:
         errors: list = []
         stop_signal = stop_event or threading.Event()
 
-        thread = threading.Thread(
-            target=self._run_generation,
-            kwargs={
-                "inputs": inputs,
-                "audio_streamer": audio_streamer,
-                "errors": errors,
-                "cfg_scale": cfg_scale,
-                "do_sample": do_sample,
-                "temperature": temperature,
-                "top_p": top_p,
-                "refresh_negative": refresh_negative,
-                "prefilled_outputs": prefilled_outputs,
-                "stop_event": stop_signal,
-            },
-            daemon=True,
-        )
-        thread.start()
+        generation_kwargs = {
+            "inputs": inputs,
+            "audio_streamer": audio_streamer,
+            "errors": errors,
+            "cfg_scale": cfg_scale,
+            "do_sample": do_sample,
+            "temperature": temperature,
+            "top_p": top_p,
+            "refresh_negative": refresh_negative,
+            "prefilled_outputs": prefilled_outputs,
+            "stop_event": stop_signal,
+        }
+        if executor is not None:
+            wait_generation = executor.submit(self._run_generation, **generation_kwargs).result
+        else:
+            thread = threading.Thread(
+                target=self._run_generation,
+                kwargs=generation_kwargs,
+                daemon=True,
+            )
+            thread.start()
+            wait_generation = thread.join
 
         generated_samples = 0
 
@@ -322,7 +331,7 @@ class StreamingTTSService:
         finally:
             stop_signal.set()
             audio_streamer.end()
-            thread.join()
+            wait_generation()
             if errors:
                 emit("generation_error", message=str(errors[0]))
                 raise errors[0]
@@ -332,6 +341,12 @@ class StreamingTTSService:
         pcm = (chunk * 32767.0).astype(np.int16)
         return pcm.tobytes()
 
+    def chunk_to_pcm16_into(self, chunk: np.ndarray, out) -> int:
+        """Write ``chunk`` as int16 PCM into the writable buffer ``out``; returns bytes written."""
+        pcm = np.frombuffer(out, dtype=np.int16, count=chunk.size)
+        np.multiply(np.clip(chunk, -1.0, 1.0), 32767.0, out=pcm, casting="unsafe")
+        return pcm.nbytes
+
 
 app = FastAPI()
 
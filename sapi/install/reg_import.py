@@ -0,0 +1,56 @@
+"""
+Batch voice-token registration through a single 'reg import'.
+Shared by vibevoice_installer.py and register_onecore.py.
+"""
+
+import os
+import subprocess
+import tempfile
+
+# reg.exe runs hidden, without a conhost
+_SI = subprocess.STARTUPINFO()
+_SI.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+_CF = subprocess.CREATE_NO_WINDOW
+
+
+def reg_str(value):
+    """Quote a string value for a .reg file."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def build_reg_file(clsid, voices):
+    """
+    Build a .reg file registering voice tokens under HKLM.
+    voices: iterable of (key path relative to HKLM, display name, voice id, gender).
+    """
+    lines = ['Windows Registry Editor Version 5.00', '']
+    for path, name, voice_id, gender in voices:
+        key = f"HKEY_LOCAL_MACHINE\\{path}"
+        lines += [
+            f'[{key}]',
+            f'@={reg_str(name)}',
+            f'"CLSID"={reg_str(clsid)}',
+            f'"VoiceId"={reg_str(voice_id)}',
+            '',
+            f'[{key}\\Attributes]',
+            f'"Name"={reg_str(name)}',
+            f'"Gender"={reg_str(gender)}',
+            '"Language"="409"',
+            '"Age"="Adult"',
+            '"Vendor"="VibeVoice"',
+            '',
+        ]
+    return '\r\n'.join(lines)
+
+
+def import_reg_file(content):
+    """Apply a .reg file with a single 'reg import' call."""
+    fd, path = tempfile.mkstemp(suffix='.reg')
+    try:
+        # newline='' so the CRLF joins above aren't translated again on Windows
+        with os.fdopen(fd, 'w', encoding='utf-16', newline='') as f:
+            f.write(content)
+        subprocess.run(['reg', 'import', path], check=True, capture_output=True,
+                       startupinfo=_SI, creationflags=_CF)
+    finally:
+        os.remove(path)
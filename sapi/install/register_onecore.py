@@ -3,9 +3,12 @@ Register VibeVoice voices in Windows 11 OneCore registry.
 Run this script as Administrator.
 """
 import ctypes
+import subprocess
 import sys
 import winreg
 
+from reg_import import build_reg_file, import_reg_file
+
 def is_admin():
     try:
         return ctypes.windll.shell32.IsUserAnAdmin()
@@ -19,6 +22,7 @@ if not is_admin():
     sys.exit(1)
 
 CLSID = '{A1B2C3D4-E5F6-7890-ABCD-EF1234567890}'
+TOKENS_BASE = r'SOFTWARE\Microsoft\Speech_OneCore\Voices\Tokens'
 VOICES = [
     {'name': 'VibeVoice Carter', 'id': 'en-Carter_man', 'gender': 'Male', 'token': 'VibeVoice-Carter'},
     {'name': 'VibeVoice Davis', 'id': 'en-Davis_man', 'gender': 'Male', 'token': 'VibeVoice-Davis'},
@@ -29,32 +33,41 @@ VOICES = [
     {'name': 'VibeVoice Samuel', 'id': 'in-Samuel_man', 'gender': 'Male', 'token': 'VibeVoice-Samuel'},
 ]
 
+
 print("Registering VibeVoice voices in Windows 11 OneCore...")
 print()
 
-base = r'SOFTWARE\Microsoft\Speech_OneCore\Voices\Tokens'
 success_count = 0
 
-for v in VOICES:
-    try:
-        key = winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, f"{base}\\{v['token']}")
-        winreg.SetValueEx(key, '', 0, winreg.REG_SZ, v['name'])
-        winreg.SetValueEx(key, 'CLSID', 0, winreg.REG_SZ, CLSID)
-        winreg.SetValueEx(key, 'VoiceId', 0, winreg.REG_SZ, v['id'])
+# Register all voices in one batch; fall back to per-voice winreg calls on failure
+log = []
+try:
+    import_reg_file(build_reg_file(CLSID, ((f"{TOKENS_BASE}\\{v['token']}", v['name'], v['id'], v['gender'])
+                                           for v in VOICES)))
+    log += [f"  [OK] {v['name']}\n" for v in VOICES]
+    success_count = len(VOICES)
+except (OSError, subprocess.CalledProcessError) as e:
+    log.append(f"  Batch import failed ({e}), registering voices individually...\n")
+
+    for v in VOICES:
+        try:
+            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, f"{TOKENS_BASE}\\{v['token']}") as key:
+                winreg.SetValueEx(key, '', 0, winreg.REG_SZ, v['name'])
+                winreg.SetValueEx(key, 'CLSID', 0, winreg.REG_SZ, CLSID)
+                winreg.SetValueEx(key, 'VoiceId', 0, winreg.REG_SZ, v['id'])
 
-        attr = winreg.CreateKey(key, 'Attributes')
-        winreg.SetValueEx(attr, 'Name', 0, winreg.REG_SZ, v['name'])
-        winreg.SetValueEx(attr, 'Gender', 0, winreg.REG_SZ, v['gender'])
-        winreg.SetValueEx(attr, 'Language', 0, winreg.REG_SZ, '409')
-        winreg.SetValueEx(attr, 'Age', 0, winreg.REG_SZ, 'Adult')
-        winreg.SetValueEx(attr, 'Vendor', 0, winreg.REG_SZ, 'VibeVoice')
-        winreg.CloseKey(attr)
-        winreg.CloseKey(key)
-        print(f"  [OK] {v['name']}")
-        success_count += 1
-    except Exception as e:
-        print(f"  [FAILED] {v['name']}: {e}")
+                with winreg.CreateKey(key, 'Attributes') as attr:
+                    winreg.SetValueEx(attr, 'Name', 0, winreg.REG_SZ, v['name'])
+                    winreg.SetValueEx(attr, 'Gender', 0, winreg.REG_SZ, v['gender'])
+                    winreg.SetValueEx(attr, 'Language', 0, winreg.REG_SZ, '409')
+                    winreg.SetValueEx(attr, 'Age', 0, winreg.REG_SZ, 'Adult')
+                    winreg.SetValueEx(attr, 'Vendor', 0, winreg.REG_SZ, 'VibeVoice')
+            log.append(f"  [OK] {v['name']}\n")
+            success_count += 1
+        except Exception as e:
+            log.append(f"  [FAILED] {v['name']}: {e}\n")
 
+sys.stdout.write(''.join(log))
 print()
 print(f"Registered {success_count}/{len(VOICES)} voices.")
 print()
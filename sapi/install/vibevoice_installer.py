@@ -4,15 +4,18 @@ Run as Administrator to install, check, and manage VibeVoice TTS components.
 """
 
 import ctypes
+import ctypes.wintypes as wintypes
 import os
 import sys
 import subprocess
 import winreg
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
 from pathlib import Path
 import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from reg_import import build_reg_file, import_reg_file
 
 # Constants
 CLSID = "{A1B2C3D4-E5F6-7890-ABCD-EF1234567890}"
@@ -20,23 +23,121 @@ PIPE_NAME = r"\\.\pipe\vibevoice"
 SERVICE_NAME = "VibeVoiceTTS"
 SERVER_SCRIPT_NAME = "sapi_pipe_server.py"
 
-# Voice definitions
-VOICES = [
-    {"name": "VibeVoice Carter", "id": "en-Carter_man", "gender": "Male", "token": "VibeVoice-Carter"},
-    {"name": "VibeVoice Davis", "id": "en-Davis_man", "gender": "Male", "token": "VibeVoice-Davis"},
-    {"name": "VibeVoice Emma", "id": "en-Emma_woman", "gender": "Female", "token": "VibeVoice-Emma"},
-    {"name": "VibeVoice Frank", "id": "en-Frank_man", "gender": "Male", "token": "VibeVoice-Frank"},
-    {"name": "VibeVoice Grace", "id": "en-Grace_woman", "gender": "Female", "token": "VibeVoice-Grace"},
-    {"name": "VibeVoice Mike", "id": "en-Mike_man", "gender": "Male", "token": "VibeVoice-Mike"},
-    {"name": "VibeVoice Samuel", "id": "in-Samuel_man", "gender": "Male", "token": "VibeVoice-Samuel"},
-]
+# Win32 process check
+SYNCHRONIZE = 0x00100000
+WAIT_TIMEOUT = 0x102
+ERROR_ACCESS_DENIED = 5
+ERROR_SEM_TIMEOUT = 121
 
-def is_admin():
+# Directory change notifications (server.pid watcher)
+FILE_NOTIFY_CHANGE_FILE_NAME = 0x1
+FILE_NOTIFY_CHANGE_LAST_WRITE = 0x10
+INFINITE = 0xFFFFFFFF
+INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+# Console tools (reg, regsvr32, tasklist, nvidia-smi...) run hidden, without a conhost
+_SI = subprocess.STARTUPINFO()
+_SI.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+_CF = subprocess.CREATE_NO_WINDOW
+
+# Voice definitions
+Voice = namedtuple("Voice", "name id gender token")
+
+VOICES = (
+    Voice("VibeVoice Carter", "en-Carter_man", "Male", "VibeVoice-Carter"),
+    Voice("VibeVoice Davis", "en-Davis_man", "Male", "VibeVoice-Davis"),
+    Voice("VibeVoice Emma", "en-Emma_woman", "Female", "VibeVoice-Emma"),
+    Voice("VibeVoice Frank", "en-Frank_man", "Male", "VibeVoice-Frank"),
+    Voice("VibeVoice Grace", "en-Grace_woman", "Female", "VibeVoice-Grace"),
+    Voice("VibeVoice Mike", "en-Mike_man", "Male", "VibeVoice-Mike"),
+    Voice("VibeVoice Samuel", "in-Samuel_man", "Male", "VibeVoice-Samuel"),
+)
+
+# Voices are registered in both legacy SAPI and OneCore (Windows 11) locations
+LEGACY_TOKENS = "SOFTWARE\\Microsoft\\Speech\\Voices\\Tokens"
+ONECORE_TOKENS = "SOFTWARE\\Microsoft\\Speech_OneCore\\Voices\\Tokens"
+REGISTRY_BASES = (LEGACY_TOKENS, ONECORE_TOKENS)
+ATTRIBUTES_KEY = "Attributes"
+
+# (base, voice, full key path) for every token we write
+_VOICE_PATHS = tuple((base, v, f"{base}\\{v.token}") for base in REGISTRY_BASES for v in VOICES)
+
+IS_ADMIN = None
+
+def _import_gui_modules():
+    """Import Tk (deferred: the non-elevated launch only relaunches itself via runas)."""
+    global tk, ttk, messagebox, scrolledtext
+    import tkinter as tk
+    from tkinter import ttk, messagebox, scrolledtext
+
+def _check_admin():
     try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
+        return bool(ctypes.windll.shell32.IsUserAnAdmin())
     except:
         return False
 
+def is_admin():
+    # Elevation can't change while we run, so only ask the shell once
+    global IS_ADMIN
+    if IS_ADMIN is None:
+        IS_ADMIN = _check_admin()
+    return IS_ADMIN
+
+class STARTUPINFOW(ctypes.Structure):
+    _fields_ = [
+        ("cb", wintypes.DWORD), ("lpReserved", wintypes.LPWSTR),
+        ("lpDesktop", wintypes.LPWSTR), ("lpTitle", wintypes.LPWSTR),
+        ("dwX", wintypes.DWORD), ("dwY", wintypes.DWORD),
+        ("dwXSize", wintypes.DWORD), ("dwYSize", wintypes.DWORD),
+        ("dwXCountChars", wintypes.DWORD), ("dwYCountChars", wintypes.DWORD),
+        ("dwFillAttribute", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+        ("wShowWindow", wintypes.WORD), ("cbReserved2", wintypes.WORD),
+        ("lpReserved2", ctypes.c_void_p), ("hStdInput", wintypes.HANDLE),
+        ("hStdOutput", wintypes.HANDLE), ("hStdError", wintypes.HANDLE),
+    ]
+
+class PROCESS_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ("hProcess", wintypes.HANDLE), ("hThread", wintypes.HANDLE),
+        ("dwProcessId", wintypes.DWORD), ("dwThreadId", wintypes.DWORD),
+    ]
+
+# One kernel32 binding with prototypes set once. use_last_error: ctypes.GetLastError()
+# may see a code clobbered by the interpreter, ctypes.get_last_error() can't.
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+for _name, _argtypes, _restype in (
+    ("OpenProcess", [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD], wintypes.HANDLE),
+    ("WaitForSingleObject", [wintypes.HANDLE, wintypes.DWORD], wintypes.DWORD),
+    ("CloseHandle", [wintypes.HANDLE], wintypes.BOOL),
+    ("WaitNamedPipeW", [wintypes.LPCWSTR, wintypes.DWORD], wintypes.BOOL),
+    ("CreateProcessW", [wintypes.LPCWSTR, wintypes.LPWSTR, ctypes.c_void_p, ctypes.c_void_p,
+                        wintypes.BOOL, wintypes.DWORD, ctypes.c_void_p, wintypes.LPCWSTR,
+                        ctypes.POINTER(STARTUPINFOW), ctypes.POINTER(PROCESS_INFORMATION)],
+     wintypes.BOOL),
+    ("FindFirstChangeNotificationW", [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD], wintypes.HANDLE),
+    ("FindNextChangeNotification", [wintypes.HANDLE], wintypes.BOOL),
+    ("FindCloseChangeNotification", [wintypes.HANDLE], wintypes.BOOL),
+):
+    _fn = getattr(_kernel32, _name)
+    _fn.argtypes, _fn.restype = _argtypes, _restype
+del _name, _argtypes, _restype, _fn
+
+def spawn_process(args, cwd, flags):
+    """Launch args with CreateProcessW (hidden, no handle inheritance) and return the PID."""
+    si = STARTUPINFOW()
+    si.cb = ctypes.sizeof(si)
+    si.dwFlags = subprocess.STARTF_USESHOWWINDOW
+    si.wShowWindow = subprocess.SW_HIDE
+    pi = PROCESS_INFORMATION()
+    cmdline = ctypes.create_unicode_buffer(subprocess.list2cmdline(args))  # must be writable
+
+    if not _kernel32.CreateProcessW(None, cmdline, None, None, False, flags, None, cwd,
+                                   ctypes.byref(si), ctypes.byref(pi)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    _kernel32.CloseHandle(pi.hThread)
+    _kernel32.CloseHandle(pi.hProcess)
+    return pi.dwProcessId
+
 def run_as_admin():
     if sys.argv[0].endswith('.py'):
         script = sys.argv[0]
@@ -47,7 +148,18 @@ def run_as_admin():
     sys.exit()
 
 class VibeVoiceInstaller:
+    __slots__ = (
+        "root", "script_dir", "sapi_dir", "project_dir", "dll_path", "service_script",
+        "pipe_server_script", "pid_file", "server_pid", "external_pid",
+        "_com_cache", "_pid_cache", "_exec", "_closing", "_voice_iids",
+        "status_tab", "actions_tab", "log_tab", "log_text", "tree",
+        "lbl_dll_path", "lbl_dll_reg", "lbl_server", "lbl_pipe", "lbl_pid",
+        "gpu_var", "gpu_combo", "btn_start", "btn_stop",
+        "startup_status_label", "btn_add_startup", "btn_remove_startup",
+    )
+
     def __init__(self, root):
+        _import_gui_modules()  # No-op after the first call; binds tk names for importers too
         self.root = root
         self.root.title("VibeVoice SAPI Installer (Enhanced)")
         self.root.geometry("850x750")
@@ -66,12 +178,18 @@ class VibeVoiceInstaller:
         self.pid_file = self.project_dir / "server.pid"
 
         # State
-        self.server_process = None
+        self.server_pid = None
         self.external_pid = None
+        self._com_cache = (0.0, False)  # (checked_at, registered); reset whenever we run regsvr32
+        self._pid_cache = (0, None)     # (mtime_ns, pid) of server.pid
         
+        # All background work (probes, regsvr32, server start/stop) shares these threads
+        self._exec = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vv-bg")
+        self._closing = False           # set by on_closing; workers stop scheduling UI updates
+
         self.setup_ui()
-        self.load_gpu_list()
-        self.refresh_status()
+        self.root.after(0, self._bg_bootstrap)
+        self._watch_pid_file()
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
@@ -89,9 +207,9 @@ class VibeVoiceInstaller:
         title_label = ttk.Label(header_frame, text="VibeVoice SAPI Manager", font=("Segoe UI", 16, "bold"))
         title_label.pack(side=tk.LEFT)
         
-        admin_text = "Running as Admin" if is_admin() else "NOT Admin (Restricted)"
-        admin_color = "green" if is_admin() else "red"
-        ttk.Label(header_frame, text=admin_text, foreground=admin_color, font=("Segoe UI", 10, "bold")).pack(side=tk.RIGHT)
+        admin = is_admin()  # populates IS_ADMIN for the action guards below
+        admin_text, admin_color = ("Running as Admin", "green") if admin else ("NOT Admin (Restricted)", "red")
+        ttk.Label(header_frame, text=admin_text, foreground=admin_color, style="Bold.TLabel").pack(side=tk.RIGHT)
 
         # Tabs
         notebook = ttk.Notebook(main_frame)
@@ -148,6 +266,8 @@ class VibeVoiceInstaller:
         self.tree.column("ID", width=150)
         self.tree.column("Status", width=100)
         self.tree.pack(fill=tk.BOTH, expand=True)
+        # Rows are created once; refreshes only touch the Status cell
+        self._voice_iids = {v.token: self.tree.insert("", "end", values=(v.name, v.id, "?")) for v in VOICES}
 
     def setup_actions_tab(self):
         # Server Controls
@@ -208,14 +328,99 @@ class VibeVoiceInstaller:
         self.log_text.insert(tk.END, f"[{ts}] {msg}\n")
         self.log_text.see(tk.END)
 
+    # --- BACKGROUND WORK ---
+    # subprocess/winreg calls run on worker threads; widgets are only touched on
+    # the Tk thread, via root.after (safe to call from any thread).
+    def _ui(self, fn, *args):
+        """Schedule fn(*args) on the Tk main thread (dropped once the window is closing)."""
+        if self._closing:
+            return
+        try:
+            self.root.after(0, fn, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # Root destroyed between the check and the call
+
+    def _log_bg(self, msg):
+        """log() from a worker thread."""
+        self._ui(self.log, msg)
+
+    def _run_steps(self, *steps):
+        """Run blocking steps in order on a worker thread, then refresh status once."""
+        def worker():
+            for step in steps:
+                step()
+            self._ui(self.refresh_status)
+        self._exec.submit(worker)
+
+    def _bg_bootstrap(self):
+        """Kick off GPU detection and the first status refresh in parallel."""
+        self.load_gpu_list()
+        self.refresh_status()
+
+    def _watch_pid_file(self):
+        """Refresh status whenever server.pid is created, rewritten or removed
+        (e.g. by the tray app), instead of polling."""
+        h_change = _kernel32.FindFirstChangeNotificationW(
+            str(self.pid_file.parent), False,
+            FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        if h_change == INVALID_HANDLE_VALUE:
+            return
+
+        def pid_mtime():
+            try:
+                return self.pid_file.stat().st_mtime_ns
+            except OSError:
+                return None  # Removed (or not written yet)
+
+        def watch():
+            # The notification covers the whole project root; only server.pid matters
+            last = pid_mtime()
+            try:
+                while _kernel32.WaitForSingleObject(h_change, INFINITE) == 0:
+                    if self._closing or not _kernel32.FindNextChangeNotification(h_change):
+                        break
+                    mtime = pid_mtime()
+                    if mtime != last:
+                        last = mtime
+                        self._ui(self.refresh_status)
+            finally:
+                _kernel32.FindCloseChangeNotification(h_change)
+
+        threading.Thread(target=watch, daemon=True).start()
+
     # --- GPU DETECTION ---
     def load_gpu_list(self):
-        """Detect GPUs using nvidia-smi."""
+        """Detect GPUs in the background and fill the combo box when done."""
+        self._exec.submit(lambda: self._ui(self._show_gpus, self._detect_gpus()))
+
+    def _detect_gpus(self):
+        """Detect GPUs via NVML in-process, falling back to nvidia-smi."""
         gpus = ["cpu"]
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+            try:
+                for i in range(pynvml.nvmlDeviceGetCount()):
+                    name = pynvml.nvmlDeviceGetName(pynvml.nvmlDeviceGetHandleByIndex(i))
+                    if isinstance(name, bytes): name = name.decode()
+                    gpus.append(f"cuda:{i} ({name})")
+            finally:
+                pynvml.nvmlShutdown()
+        except Exception:
+            # pynvml missing or NVML unavailable
+            gpus = ["cpu"] + self._detect_gpus_smi()
+
+        # Remove duplicates and prioritize CUDA
+        return sorted(list(set(gpus)), key=lambda x: 0 if "cuda" in x else 1)
+
+    def _detect_gpus_smi(self):
+        """Detect GPUs using nvidia-smi."""
+        gpus = []
         try:
             # Run nvidia-smi to get index and name
             cmd = ["nvidia-smi", "--query-gpu=index,name", "--format=csv,noheader"]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(cmd, capture_output=True, text=True, startupinfo=_SI, creationflags=_CF)
             if result.returncode == 0:
                 lines = result.stdout.strip().split('\n')
                 for line in lines:
@@ -226,10 +431,9 @@ class VibeVoiceInstaller:
         except Exception:
             # Fallback if nvidia-smi fails
             gpus.extend(["cuda:0", "cuda:1"])
-            
-        # Update combo box
-        # Remove duplicates and prioritize CUDA
-        final_list = sorted(list(set(gpus)), key=lambda x: 0 if "cuda" in x else 1)
+        return gpus
+
+    def _show_gpus(self, final_list):
         self.gpu_combo['values'] = final_list
         if len(final_list) > 0:
             self.gpu_combo.current(0)
@@ -237,64 +441,100 @@ class VibeVoiceInstaller:
 
     # --- PROCESS MANAGEMENT (THE FIX) ---
     def get_saved_pid(self):
-        """Read PID from server.pid file."""
-        if self.pid_file.exists():
-            try:
-                return int(self.pid_file.read_text().strip())
-            except:
-                return None
-        return None
+        """Read PID from server.pid file (re-read only when its mtime changes)."""
+        try:
+            st = self.pid_file.stat()
+        except OSError:
+            self._pid_cache = (0, None)
+            return None
+        if st.st_mtime_ns == self._pid_cache[0]:
+            return self._pid_cache[1]
+        try:
+            pid = int(self.pid_file.read_text().strip())
+        except Exception:
+            pid = None
+        self._pid_cache = (st.st_mtime_ns, pid)
+        return pid
 
     def is_process_running(self, pid):
         """Check if a process with PID is actually running."""
         if not pid: return False
+        h = _kernel32.OpenProcess(SYNCHRONIZE, False, int(pid))
+        if h:
+            try:
+                # Still running if the process handle is not yet signaled
+                return _kernel32.WaitForSingleObject(h, 0) == WAIT_TIMEOUT
+            finally:
+                _kernel32.CloseHandle(h)
+        if ctypes.get_last_error() != ERROR_ACCESS_DENIED:
+            return False
         try:
-            # Use tasklist to filter by PID
+            # Process exists but we can't open it; let tasklist decide
             cmd = ["tasklist", "/FI", f"PID eq {pid}", "/FO", "CSV"]
-            out = subprocess.check_output(cmd).decode()
+            out = subprocess.check_output(cmd, startupinfo=_SI, creationflags=_CF).decode()
             return str(pid) in out
         except:
             return False
 
     def refresh_status(self):
-        # 1. Check DLL
-        if self.dll_path.exists():
+        """Run the status probes concurrently in the background; each result is rendered as it arrives."""
+        # (probe, render, result rendered if the probe raises)
+        probes = (
+            (self.dll_path.exists, self._show_dll, False),
+            (self.check_com_registered, self._show_com, False),
+            (self._probe_server, self._show_server, None),
+            (self._probe_pipe, self._show_pipe, False),
+            (self._probe_voices, self.refresh_voices_tree, frozenset()),
+            (self.is_in_startup, self._show_startup, False),
+        )
+        # Total time is the slowest probe, not the sum
+        for probe, render, failed in probes:
+            self._exec.submit(self._run_probe, probe, render, failed)
+
+    def _run_probe(self, probe, render, failed):
+        """Run one status probe on a worker; a failure is logged and rendered, never left stale."""
+        try:
+            result = probe()
+        except Exception as e:
+            self._log_bg(f"Status check failed ({probe.__name__}): {e}")
+            result = failed
+        self._ui(render, result)
+
+    def _probe_server(self):
+        """Return the PID of the running server, cleaning up a stale pid file."""
+        saved_pid = self.get_saved_pid()
+        if saved_pid and self.is_process_running(saved_pid):
+            return saved_pid
+        if self.pid_file.exists():
+            try: self.pid_file.unlink() # Clean up stale file
+            except: pass
+        return None
+
+    def _probe_pipe(self):
+        # Test for a listening instance without connecting to (and waking) the server.
+        # 0 would mean "server default timeout", so wait 1 ms instead.
+        if _kernel32.WaitNamedPipeW(PIPE_NAME, 1):
+            return True
+        # Instances exist but are all busy: the server is still alive
+        return ctypes.get_last_error() == ERROR_SEM_TIMEOUT
+
+    def _show_dll(self, dll_exists):
+        if dll_exists:
             self.lbl_dll_path.config(text=f"DLL Found: {self.dll_path.name}", foreground="green")
         else:
             self.lbl_dll_path.config(text="DLL NOT FOUND (Build Solution in Release x64)", foreground="red")
 
-        # 2. Check Registry
-        if self.check_com_registered():
+    def _show_com(self, registered):
+        if registered:
             self.lbl_dll_reg.config(text="COM Registered: YES", foreground="green")
         else:
             self.lbl_dll_reg.config(text="COM Registered: NO", foreground="red")
 
-        # 3. Check Server (Robust)
-        saved_pid = self.get_saved_pid()
-        is_running = False
-        
-        if saved_pid and self.is_process_running(saved_pid):
-            self.external_pid = saved_pid
-            is_running = True
-        else:
-            self.external_pid = None
-            if self.pid_file.exists():
-                try: self.pid_file.unlink() # Clean up stale file
-                except: pass
-
-        # 4. Check Pipe
-        pipe_ok = False
-        try:
-            import win32file
-            h = win32file.CreateFile(PIPE_NAME, win32file.GENERIC_READ, 0, None, 3, 0, None)
-            win32file.CloseHandle(h)
-            pipe_ok = True
-        except:
-            pass
-
-        if is_running:
+    def _show_server(self, pid):
+        self.external_pid = pid
+        if pid:
             self.lbl_server.config(text="✓ Server Running", foreground="green")
-            self.lbl_pid.config(text=f"PID: {self.external_pid}")
+            self.lbl_pid.config(text=f"PID: {pid}")
             self.btn_start.state(['disabled'])
             self.btn_stop.state(['!disabled'])
         else:
@@ -303,149 +543,192 @@ class VibeVoiceInstaller:
             self.btn_start.state(['!disabled'])
             self.btn_stop.state(['disabled'])
 
+    def _show_pipe(self, pipe_ok):
         if pipe_ok:
             self.lbl_pipe.config(text="✓ Pipe Connected", foreground="green")
         else:
             self.lbl_pipe.config(text="Waiting for pipe...", foreground="orange")
 
-        # 5. Voices
-        self.refresh_voices_tree()
-
-        # 6. Startup status
-        self.refresh_startup_status()
-
     def start_server(self):
         if not self.pipe_server_script.exists():
             messagebox.showerror("Error", "Server script not found.")
             return
+        self._run_steps(self._start_server_step(self._selected_device()))
 
+    def _selected_device(self):
         # Get selected device from string (e.g. "cuda:0 (RTX 5090)" -> "cuda:0")
         raw_selection = self.gpu_var.get()
-        device_arg = raw_selection.split(' ')[0]
-
-        self.log(f"Starting server on {device_arg}...")
+        return raw_selection.split(' ')[0]
 
-        try:
+    def _start_server_step(self, device_arg):
+        def step():
+            self._log_bg(f"Starting server on {device_arg}...")
+            args = [sys.executable, str(self.pipe_server_script), "--device", device_arg]
             # CREATE_NEW_PROCESS_GROUP is important for detached processes
-            self.server_process = subprocess.Popen(
-                [sys.executable, str(self.pipe_server_script), "--device", device_arg],
-                cwd=str(self.project_dir),
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
-            )
-            
-            # Save PID immediately
-            self.pid_file.write_text(str(self.server_process.pid))
-            self.log(f"Server started with PID {self.server_process.pid}")
-            
-            # Start a thread to monitor output (optional, keeping it simple here)
-            time.sleep(1)
-            self.refresh_status()
-            
-        except Exception as e:
-            self.log(f"Error starting: {e}")
-            messagebox.showerror("Error", str(e))
+            flags = subprocess.CREATE_NEW_PROCESS_GROUP | _CF
+            try:
+                try:
+                    # Launch-and-forget: no pipes or inherited handles needed
+                    self.server_pid = spawn_process(args, str(self.project_dir), flags)
+                except OSError:
+                    self.server_pid = subprocess.Popen(
+                        args, cwd=str(self.project_dir), startupinfo=_SI, creationflags=flags
+                    ).pid
+
+                # Save PID immediately
+                self.pid_file.write_text(str(self.server_pid))
+                self._log_bg(f"Server started with PID {self.server_pid}")
+
+                # Give the process a moment before the status refresh
+                time.sleep(1)
+
+            except Exception as e:
+                self._log_bg(f"Error starting: {e}")
+                self._ui(messagebox.showerror, "Error", str(e))
+        return step
 
     def stop_server(self):
         # Prefer internal handle, fallback to file
         pid_to_kill = None
-        
-        if self.server_process:
-            pid_to_kill = self.server_process.pid
+
+        if self.server_pid:
+            pid_to_kill = self.server_pid
         elif self.external_pid:
             pid_to_kill = self.external_pid
 
-        if pid_to_kill:
-            self.log(f"Stopping PID {pid_to_kill}...")
+        def step():
+            if not pid_to_kill:
+                return
+            self._log_bg(f"Stopping PID {pid_to_kill}...")
             try:
                 # Force kill
-                subprocess.run(["taskkill", "/F", "/PID", str(pid_to_kill)], capture_output=True)
-                self.server_process = None
+                subprocess.run(["taskkill", "/F", "/PID", str(pid_to_kill)], capture_output=True,
+                               startupinfo=_SI, creationflags=_CF)
+                self.server_pid = None
                 self.external_pid = None
                 if self.pid_file.exists():
                     self.pid_file.unlink()
-                self.log("Server stopped.")
+                self._log_bg("Server stopped.")
             except Exception as e:
-                self.log(f"Failed to kill: {e}")
-        
-        self.refresh_status()
+                self._log_bg(f"Failed to kill: {e}")
+
+        self._run_steps(step)
 
     # --- REGISTRY HELPERS ---
     def check_com_registered(self):
+        checked_at, registered = self._com_cache
+        if time.monotonic() - checked_at < 2.0:
+            return registered
         try:
-            winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, f"SOFTWARE\\Classes\\CLSID\\{CLSID}")
-            return True
-        except:
-            return False
+            # The DLL is x64: read the 64-bit view directly, no WOW64 redirection
+            winreg.OpenKeyEx(winreg.HKEY_LOCAL_MACHINE, f"SOFTWARE\\Classes\\CLSID\\{CLSID}",
+                             0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY).Close()
+            registered = True
+        except OSError:
+            registered = False
+        self._com_cache = (time.monotonic(), registered)
+        return registered
 
     def register_dll(self):
-        if not is_admin(): return messagebox.showerror("Admin", "Run as Administrator required.")
-        ret = subprocess.call(["regsvr32", "/s", str(self.dll_path)])
-        if ret == 0: self.log("DLL Registered.")
-        else: self.log("DLL Registration Failed.")
-        self.refresh_status()
+        if not IS_ADMIN: return messagebox.showerror("Admin", "Run as Administrator required.")
+        self._run_steps(self._register_dll)
 
     def unregister_dll(self):
-        if not is_admin(): return messagebox.showerror("Admin", "Run as Administrator required.")
-        subprocess.call(["regsvr32", "/u", "/s", str(self.dll_path)])
-        self.log("DLL Unregistered.")
-        self.refresh_status()
+        if not IS_ADMIN: return messagebox.showerror("Admin", "Run as Administrator required.")
+        self._run_steps(self._unregister_dll)
 
     def register_voices(self):
-        if not is_admin(): return messagebox.showerror("Admin", "Run as Administrator required.")
-        self.log("Registering voices...")
+        if not IS_ADMIN: return messagebox.showerror("Admin", "Run as Administrator required.")
+        self._run_steps(self._register_voices)
+
+    def fix_registry(self):
+        if not IS_ADMIN: return messagebox.showerror("Admin", "Run as Administrator required.")
+        # Remove old stuff, then re-register; one status refresh at the end
+        self._run_steps(
+            self._unregister_dll,
+            self._register_dll,
+            self._register_voices,
+            lambda: self._log_bg("Registry reset complete."),
+        )
+
+    def _register_dll(self):
+        ret = subprocess.call(["regsvr32", "/s", str(self.dll_path)], startupinfo=_SI, creationflags=_CF)
+        self._com_cache = (0.0, False)
+        if ret == 0: self._log_bg("DLL Registered.")
+        else: self._log_bg("DLL Registration Failed.")
+
+    def _unregister_dll(self):
+        subprocess.call(["regsvr32", "/u", "/s", str(self.dll_path)], startupinfo=_SI, creationflags=_CF)
+        self._com_cache = (0.0, False)
+        self._log_bg("DLL Unregistered.")
+
+    def _register_voices(self):
+        self._log_bg("Registering voices...")
+        # One transactional 'reg import' for everything; per-voice winreg calls only as fallback
         try:
-            # Register in both legacy SAPI and OneCore (Windows 11) locations
-            registry_bases = [
-                "SOFTWARE\\Microsoft\\Speech\\Voices\\Tokens",           # Legacy SAPI5
-                "SOFTWARE\\Microsoft\\Speech_OneCore\\Voices\\Tokens",   # Windows 11 OneCore
-            ]
-
-            for base in registry_bases:
-                for v in VOICES:
-                    try:
-                        key = winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, f"{base}\\{v['token']}")
-                        winreg.SetValueEx(key, "", 0, winreg.REG_SZ, v['name'])
+            import_reg_file(build_reg_file(CLSID, ((path, v.name, v.id, v.gender)
+                                                   for _, v, path in _VOICE_PATHS)))
+            self._log_bg("Voices registered in legacy SAPI and OneCore locations.")
+            return
+        except (OSError, subprocess.CalledProcessError) as e:
+            self._log_bg(f"Batch import failed ({e}), registering voices individually...")
+
+        try:
+            for base, v, path in _VOICE_PATHS:
+                try:
+                    with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, path) as key:
+                        winreg.SetValueEx(key, "", 0, winreg.REG_SZ, v.name)
                         winreg.SetValueEx(key, "CLSID", 0, winreg.REG_SZ, CLSID)
-                        winreg.SetValueEx(key, "VoiceId", 0, winreg.REG_SZ, v['id'])
-
-                        attr = winreg.CreateKey(key, "Attributes")
-                        winreg.SetValueEx(attr, "Name", 0, winreg.REG_SZ, v['name'])
-                        winreg.SetValueEx(attr, "Gender", 0, winreg.REG_SZ, v['gender'])
-                        winreg.SetValueEx(attr, "Language", 0, winreg.REG_SZ, "409")
-                        # Additional attributes for OneCore compatibility
-                        winreg.SetValueEx(attr, "Age", 0, winreg.REG_SZ, "Adult")
-                        winreg.SetValueEx(attr, "Vendor", 0, winreg.REG_SZ, "VibeVoice")
-                        winreg.CloseKey(attr)
-                        winreg.CloseKey(key)
-                    except Exception as e:
-                        self.log(f"Warning: Could not register {v['token']} in {base}: {e}")
-
-            self.log("Voices registered in legacy SAPI and OneCore locations.")
+                        winreg.SetValueEx(key, "VoiceId", 0, winreg.REG_SZ, v.id)
+
+                        with winreg.CreateKey(key, ATTRIBUTES_KEY) as attr:
+                            winreg.SetValueEx(attr, "Name", 0, winreg.REG_SZ, v.name)
+                            winreg.SetValueEx(attr, "Gender", 0, winreg.REG_SZ, v.gender)
+                            winreg.SetValueEx(attr, "Language", 0, winreg.REG_SZ, "409")
+                            # Additional attributes for OneCore compatibility
+                            winreg.SetValueEx(attr, "Age", 0, winreg.REG_SZ, "Adult")
+                            winreg.SetValueEx(attr, "Vendor", 0, winreg.REG_SZ, "VibeVoice")
+                except Exception as e:
+                    self._log_bg(f"Warning: Could not register {v.token} in {base}: {e}")
+
+            self._log_bg("Voices registered in legacy SAPI and OneCore locations.")
         except Exception as e:
-            self.log(f"Error: {e}")
-        self.refresh_status()
+            self._log_bg(f"Error: {e}")
 
-    def fix_registry(self):
-        # Remove old stuff
-        self.unregister_dll()
-        self.register_dll()
-        self.register_voices()
-        self.log("Registry reset complete.")
-
-    def refresh_voices_tree(self):
-        for i in self.tree.get_children(): self.tree.delete(i)
+    def _probe_voices(self):
+        """Return the set of voice tokens present in the legacy Tokens key."""
+        # One handle on the Tokens key, enumerate its subkeys, then test membership
+        existing = set()
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, LEGACY_TOKENS) as tokens:
+                i = 0
+                while True:
+                    try:
+                        existing.add(winreg.EnumKey(tokens, i))
+                    except OSError:
+                        break
+                    i += 1
+        except OSError:
+            pass
+        return existing
+
+    def refresh_voices_tree(self, existing):
         for v in VOICES:
-            try:
-                winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, f"SOFTWARE\\Microsoft\\Speech\\Voices\\Tokens\\{v['token']}")
-                status = "OK"
-            except:
-                status = "Missing"
-            self.tree.insert("", "end", values=(v['name'], v['id'], status))
+            iid = self._voice_iids[v.token]
+            want = "OK" if v.token in existing else "Missing"
+            if self.tree.set(iid, "Status") != want:
+                self.tree.set(iid, "Status", want)
 
     def install_all(self):
-        self.register_dll()
-        self.register_voices()
-        self.start_server()
+        if not IS_ADMIN: return messagebox.showerror("Admin", "Run as Administrator required.")
+        if not self.pipe_server_script.exists():
+            messagebox.showerror("Error", "Server script not found.")
+            return
+        self._run_steps(
+            self._register_dll,
+            self._register_voices,
+            self._start_server_step(self._selected_device()),
+        )
 
     def open_settings(self):
         os.system("start ms-settings:speech")
@@ -478,7 +761,10 @@ class VibeVoiceInstaller:
 
     def refresh_startup_status(self):
         """Update startup status display."""
-        if self.is_in_startup():
+        self._show_startup(self.is_in_startup())
+
+    def _show_startup(self, in_startup):
+        if in_startup:
             self.startup_status_label.config(text="Auto-Start: ON", foreground="green")
             self.btn_add_startup.state(['disabled'])
             self.btn_remove_startup.state(['!disabled'])
@@ -534,13 +820,18 @@ class VibeVoiceInstaller:
 
     def on_closing(self):
         # Don't kill server on exit automatically, just update state
+        self._closing = True
+        self._exec.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
 
 if __name__ == "__main__":
     if not is_admin():
         # Re-run as admin
         run_as_admin()
-    
+
+    # tkinter is only loaded once we know we're staying (not relaunching elevated)
+    _import_gui_modules()
+
     root = tk.Tk()
     app = VibeVoiceInstaller(root)
     root.mainloop()
\ No newline at end of file
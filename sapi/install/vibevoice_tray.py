@@ -14,30 +14,51 @@ import subprocess
 import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Ensure parent paths are available
 SCRIPT_DIR = Path(__file__).parent.absolute()
 SAPI_DIR = SCRIPT_DIR.parent
 PROJECT_DIR = SAPI_DIR.parent
-sys.path.insert(0, str(PROJECT_DIR))
-
-import tkinter as tk
-from tkinter import ttk, messagebox
+# str forms, converted once for subprocess/open calls
+SCRIPT_DIR_S = str(SCRIPT_DIR)
+PROJECT_DIR_S = str(PROJECT_DIR)
+sys.path.insert(0, PROJECT_DIR_S)
 
 # Windows-specific
 if sys.platform == "win32":
-    import win32file
+    import win32api
+    import win32con
+    import win32pipe
+    import win32process
     import pywintypes
+    import winerror
 else:
     print("Error: Windows only")
     sys.exit(1)
 
+
+def _import_gui_modules():
+    """Import Tk (deferred: the --add/--remove-startup paths don't need it)."""
+    global tk, ttk, messagebox
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+
 # Constants
 PIPE_NAME = r"\\.\pipe\vibevoice"
 CONFIG_FILE = SCRIPT_DIR / "vibevoice_tray_config.json"
+DEVICE_CACHE_FILE = SCRIPT_DIR / "vibevoice_devices.json"
+DEVICE_CACHE_TTL = 24 * 3600  # GPU list rarely changes within a day
 PID_FILE = PROJECT_DIR / "server.pid"
 SERVER_SCRIPT = PROJECT_DIR / "demo" / "sapi_pipe_server.py"
+CONFIG_FILE_S = str(CONFIG_FILE)
+SERVER_SCRIPT_S = str(SERVER_SCRIPT)
 
 # Default config
 DEFAULT_CONFIG = {
@@ -50,51 +71,99 @@ DEFAULT_CONFIG = {
 
 def load_config() -> dict:
     """Load config from JSON file."""
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                cfg = json.load(f)
-                # Merge with defaults for any missing keys
-                return {**DEFAULT_CONFIG, **cfg}
-        except:
-            pass
+    try:
+        with open(CONFIG_FILE_S, "rb") as f:
+            cfg = json.load(f)
+        # Merge with defaults for any missing keys
+        return {**DEFAULT_CONFIG, **cfg}
+    except:
+        # Missing (first run) or unreadable: use defaults
+        pass
     return DEFAULT_CONFIG.copy()
 
 
 def save_config(cfg: dict):
     """Save config to JSON file."""
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(cfg, f, indent=2)
+    write_json_atomic(CONFIG_FILE, cfg)
 
 
-def is_pipe_available() -> bool:
-    """Check if the named pipe is responding."""
+def write_json_atomic(path: Path, data):
+    """Write JSON to a temp file and swap it in, so readers never see a partial file."""
+    tmp = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        # Machine-written file: skip the indent formatter
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+    os.replace(tmp, path)
+
+
+def probe_devices() -> list | None:
+    """List devices via nvidia-smi; None if it can't be queried."""
     try:
-        h = win32file.CreateFile(
-            PIPE_NAME,
-            win32file.GENERIC_READ | win32file.GENERIC_WRITE,
-            0, None, 3, 0, None
+        # Only the index is shown in the combobox, so that's all we ask for
+        result = subprocess.run(
+            ["nvidia-smi", "--query-gpu=index", "--format=csv,noheader"],
+            capture_output=True
         )
-        win32file.CloseHandle(h)
-        return True
-    except pywintypes.error:
-        return False
+        if result.returncode == 0:
+            return ["cpu"] + [f"cuda:{int(ln)}" for ln in result.stdout.splitlines() if ln.strip()]
+    except:
+        pass
+    return None
+
+
+_pipe_cache = (0.0, False)  # (checked_at, available); coalesces back-to-back probes
+
+
+def is_pipe_available() -> bool:
+    """Check if the named pipe is listening, without connecting to it."""
+    global _pipe_cache
+    checked_at, available = _pipe_cache
+    now = time.monotonic()
+    if now - checked_at < 1.0:
+        return available
+    try:
+        win32pipe.WaitNamedPipe(PIPE_NAME, 1)
+        available = True
+    except pywintypes.error as e:
+        # ERROR_SEM_TIMEOUT: all instances busy serving clients, server is up.
+        # ERROR_FILE_NOT_FOUND: no server.
+        available = e.winerror == winerror.ERROR_SEM_TIMEOUT
+    _pipe_cache = (now, available)
+    return available
+
+
+_pid_cache = (0, None)  # (mtime_ns, pid) of server.pid; replaced in one assignment
 
 
 def get_server_pid() -> int | None:
     """Get PID from file if server is running."""
-    if PID_FILE.exists():
+    global _pid_cache
+    try:
+        st = PID_FILE.stat()
+    except OSError:
+        return None
+    # Read the tuple once: the monitor and control threads both call this
+    cached_mtime, pid = _pid_cache
+    if st.st_mtime_ns != cached_mtime:
         try:
             pid = int(PID_FILE.read_text().strip())
-            # Verify it's actually running
-            result = subprocess.run(
-                ["tasklist", "/FI", f"PID eq {pid}", "/FO", "CSV"],
-                capture_output=True, text=True
-            )
-            if str(pid) in result.stdout:
-                return pid
         except:
-            pass
+            pid = None
+        _pid_cache = (st.st_mtime_ns, pid)
+    if pid:
+        # Verify it's actually running
+        try:
+            h = win32api.OpenProcess(win32con.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        except pywintypes.error as e:
+            # Access denied still means the process exists; anything else (e.g. ERROR_INVALID_PARAMETER) means it's gone
+            return pid if e.winerror == winerror.ERROR_ACCESS_DENIED else None
+        try:
+            if win32process.GetExitCodeProcess(h) == win32con.STILL_ACTIVE:
+                return pid
+        finally:
+            win32api.CloseHandle(h)
     return None
 
 
@@ -103,10 +172,24 @@ def start_server(device: str) -> int | None:
     if not SERVER_SCRIPT.exists():
         return None
 
+    # Never clobber server.pid while the process it names is still alive
+    running = get_server_pid()
+    if running:
+        return running
+
+    # Keep .pyc writing on (any non-empty PYTHONDONTWRITEBYTECODE disables it),
+    # so later starts load the server and its imports from the bytecode cache
+    env = os.environ.copy()
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
     try:
         proc = subprocess.Popen(
-            [sys.executable, str(SERVER_SCRIPT), "--device", device],
-            cwd=str(PROJECT_DIR),
+            [sys.executable, "-u", SERVER_SCRIPT_S, "--device", device],
+            cwd=PROJECT_DIR_S,
+            env=env,
+            startupinfo=startupinfo,
             creationflags=subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW
         )
         PID_FILE.write_text(str(proc.pid))
@@ -121,7 +204,11 @@ def stop_server() -> bool:
     pid = get_server_pid()
     if pid:
         try:
-            subprocess.run(["taskkill", "/F", "/PID", str(pid)], capture_output=True)
+            h = win32api.OpenProcess(win32con.PROCESS_TERMINATE, False, pid)
+            try:
+                win32api.TerminateProcess(h, 1)
+            finally:
+                win32api.CloseHandle(h)
             if PID_FILE.exists():
                 PID_FILE.unlink()
             return True
@@ -133,15 +220,23 @@ def stop_server() -> bool:
 class VibeVoiceTrayApp:
     """Mini UI for startup/tray management."""
 
-    def __init__(self, root: tk.Tk, start_minimized: bool = False):
+    def __init__(self, root: "tk.Tk", start_minimized: bool = False):
+        _import_gui_modules()  # No-op after the first call; binds tk names for importers too
         self.root = root
         self.root.title("VibeVoice TTS")
         self.root.geometry("380x320")
         self.root.resizable(False, False)
 
         self.config = load_config()
+        self._save_pending = None  # after() id of a scheduled config write
         self.monitoring = True
         self.server_pid = None
+        # Set to wake the monitor early (start/stop/quit)
+        self._status_event = threading.Event()
+        self._poll_interval = 1.0
+        self._last_state = None  # (pid, pipe_ok) last pushed to the UI
+        # Start/stop run here, one at a time and in click order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vv-ctrl")
 
         self._setup_ui()
         self._start_monitor_thread()
@@ -175,10 +270,12 @@ class VibeVoiceTrayApp:
         self.status_indicator.pack(side=tk.LEFT, padx=(0, 10))
         self._draw_indicator("gray")
 
-        self.status_label = ttk.Label(status_frame, text="Checking...", font=("Segoe UI", 10))
+        self._status_text = tk.StringVar(value="Checking...")
+        self._pid_text = tk.StringVar()
+        self.status_label = ttk.Label(status_frame, textvariable=self._status_text, font=("Segoe UI", 10))
         self.status_label.pack(side=tk.LEFT)
 
-        self.pid_label = ttk.Label(status_frame, text="", font=("Segoe UI", 9), foreground="gray")
+        self.pid_label = ttk.Label(status_frame, textvariable=self._pid_text, font=("Segoe UI", 9), foreground="gray")
         self.pid_label.pack(side=tk.RIGHT)
 
         # Control Buttons
@@ -218,6 +315,7 @@ class VibeVoiceTrayApp:
         self.device_combo = ttk.Combobox(device_frame, textvariable=self.device_var, width=20)
         self.device_combo.pack(side=tk.LEFT, padx=10)
         self.device_combo.bind("<<ComboboxSelected>>", lambda e: self._save_settings())
+        ttk.Button(device_frame, text="↻", width=3, command=self._refresh_devices).pack(side=tk.LEFT)
         self._load_devices()
 
         # Bottom buttons
@@ -233,94 +331,143 @@ class VibeVoiceTrayApp:
         self.status_indicator.create_oval(2, 2, 14, 14, fill=color, outline="")
 
     def _load_devices(self):
-        """Load available CUDA devices."""
+        """Load available CUDA devices from the cache; re-probe in the background if stale."""
         devices = ["cuda:0", "cpu"]
         try:
-            result = subprocess.run(
-                ["nvidia-smi", "--query-gpu=index,name", "--format=csv,noheader"],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                devices = ["cpu"]
-                for line in result.stdout.strip().split('\n'):
-                    if line.strip():
-                        idx, name = line.split(',', 1)
-                        devices.append(f"cuda:{idx.strip()}")
+            with open(DEVICE_CACHE_FILE, "r") as f:
+                cache = json.load(f)
+            devices = cache["devices"]
+            if time.time() - cache["ts"] < DEVICE_CACHE_TTL:
+                self.device_combo['values'] = devices
+                return
         except:
             pass
+        # Show last-known (or default) devices now, fill in the real list when nvidia-smi returns
         self.device_combo['values'] = devices
+        self._refresh_devices()
+
+    def _refresh_devices(self):
+        """Re-probe devices in the background, ignoring the cache."""
+        threading.Thread(target=self._refresh_devices_async, daemon=True).start()
+
+    def _refresh_devices_async(self):
+        devices = probe_devices()
+        if devices is None:
+            return
+        try:
+            write_json_atomic(DEVICE_CACHE_FILE, {"ts": time.time(), "devices": devices})
+        except OSError:
+            pass
+        self.root.after(0, lambda: self.device_combo.__setitem__('values', devices))
 
     def _save_settings(self):
         """Save current settings to config."""
         self.config["auto_start_server"] = self.auto_start_var.get()
         self.config["start_minimized"] = self.start_min_var.get()
         self.config["device"] = self.device_var.get()
+        # Coalesce bursts of toggles into one write
+        if self._save_pending:
+            self.root.after_cancel(self._save_pending)
+        self._save_pending = self.root.after(500, self._flush_config)
+
+    def _flush_config(self):
+        """Write the in-memory config to disk."""
+        self._save_pending = None
         save_config(self.config)
 
     def _start_monitor_thread(self):
         """Start background thread to monitor server status."""
         def monitor():
+            last_state = None
             while self.monitoring:
-                self._update_status()
-                time.sleep(2)
+                # Clear before probing: a set() from start/stop landing after this
+                # point cuts the next wait short instead of being lost
+                self._status_event.clear()
+                state = self._update_status()
+                # Poll every 1s after a change, backing off to 10s while stable
+                if state != last_state:
+                    self._poll_interval = 1.0
+                else:
+                    self._poll_interval = min(self._poll_interval * 2, 10.0)
+                last_state = state
+                self._status_event.wait(timeout=self._poll_interval)
 
         thread = threading.Thread(target=monitor, daemon=True)
         thread.start()
 
-    def _update_status(self):
-        """Update UI with current server status."""
-        pid = get_server_pid()
-        pipe_ok = is_pipe_available()
-
-        def update_ui():
-            if pid and pipe_ok:
-                self._draw_indicator("#22c55e")  # Green
-                self.status_label.config(text="Server Running")
-                self.pid_label.config(text=f"PID: {pid}")
-                self.start_btn.config(state=tk.DISABLED)
-                self.stop_btn.config(state=tk.NORMAL)
-            elif pid:
-                self._draw_indicator("#eab308")  # Yellow - starting
-                self.status_label.config(text="Starting...")
-                self.pid_label.config(text=f"PID: {pid}")
-                self.start_btn.config(state=tk.DISABLED)
-                self.stop_btn.config(state=tk.NORMAL)
-            else:
-                self._draw_indicator("#ef4444")  # Red
-                self.status_label.config(text="Server Stopped")
-                self.pid_label.config(text="")
-                self.start_btn.config(state=tk.NORMAL)
-                self.stop_btn.config(state=tk.DISABLED)
-
-            self.server_pid = pid
+    def _update_status(self) -> tuple:
+        """Push server status to the UI if it changed; returns (pid, pipe_ok)."""
+        state = (get_server_pid(), is_pipe_available())
+        if state != self._last_state:
+            self._last_state = state
+            self.root.after(0, self._apply_state, state)
+        return state
+
+    def _apply_state(self, state: tuple):
+        """Render a (pid, pipe_ok) status on the Tk thread."""
+        pid, pipe_ok = state
+        if pid and pipe_ok:
+            self._draw_indicator("#22c55e")  # Green
+            self._status_text.set("Server Running")
+            self._pid_text.set(f"PID: {pid}")
+            self.start_btn.config(state=tk.DISABLED)
+            self.stop_btn.config(state=tk.NORMAL)
+        elif pid:
+            self._draw_indicator("#eab308")  # Yellow - starting
+            self._status_text.set("Starting...")
+            self._pid_text.set(f"PID: {pid}")
+            self.start_btn.config(state=tk.DISABLED)
+            self.stop_btn.config(state=tk.NORMAL)
+        else:
+            self._draw_indicator("#ef4444")  # Red
+            self._status_text.set("Server Stopped")
+            self._pid_text.set("")
+            self.start_btn.config(state=tk.NORMAL)
+            self.stop_btn.config(state=tk.DISABLED)
 
-        self.root.after(0, update_ui)
+        self.server_pid = pid
 
     def _auto_start_server(self):
         """Auto-start server if not running."""
-        if not get_server_pid():
-            self._start_server()
+        self._start_server()
+        self._status_event.set()
 
     def _start_server(self):
-        """Start the server."""
+        """Start the server (no-op if it's already running)."""
+        if get_server_pid():
+            return
+
         device = self.device_var.get()
-        self.status_label.config(text="Starting...")
+        self._status_text.set("Starting...")
         self._draw_indicator("#eab308")
+        self._last_state = None  # next poll re-renders over the transient text
 
         def do_start():
+            # A start queued behind another one finds the new server.pid and
+            # gets its PID back instead of launching a second server
             pid = start_server(device)
             if pid:
-                self.root.after(0, lambda: self.status_label.config(text=f"Started (PID: {pid})"))
+                self.root.after(0, self._status_text.set, f"Started (PID: {pid})")
             else:
                 self.root.after(0, lambda: messagebox.showerror("Error", "Failed to start server"))
+            self._status_event.set()
 
-        threading.Thread(target=do_start, daemon=True).start()
+        self._executor.submit(do_start)
 
     def _stop_server(self):
         """Stop the server."""
-        self.status_label.config(text="Stopping...")
-        stop_server()
-        self._update_status()
+        self._status_text.set("Stopping...")
+
+        def do_stop():
+            if stop_server():
+                # Show it stopped right away; the monitor confirms on its next pass
+                self._last_state = (None, False)
+                self.root.after(0, self._apply_state, self._last_state)
+            else:
+                self._last_state = None
+            self._status_event.set()
+
+        self._executor.submit(do_stop)
 
     def _minimize_to_tray(self):
         """Hide window (minimize to tray behavior)."""
@@ -330,7 +477,7 @@ class VibeVoiceTrayApp:
         """Open the full installer/manager."""
         manager_path = SCRIPT_DIR / "vibevoice_installer.py"
         if manager_path.exists():
-            subprocess.Popen([sys.executable, str(manager_path)], cwd=str(SCRIPT_DIR))
+            subprocess.Popen([sys.executable, str(manager_path)], cwd=SCRIPT_DIR_S)
 
     def _on_close(self):
         """Handle window close - minimize instead of exit."""
@@ -342,6 +489,11 @@ class VibeVoiceTrayApp:
     def _quit(self):
         """Actually quit the application."""
         self.monitoring = False
+        self._status_event.set()
+        self._executor.shutdown(wait=False)
+        if self._save_pending:
+            self.root.after_cancel(self._save_pending)
+            self._flush_config()
         self.root.quit()
         self.root.destroy()
 
@@ -420,6 +572,7 @@ def main():
         sys.exit(0)
 
     # Start the GUI
+    _import_gui_modules()
     root = tk.Tk()
 
     # Set icon if available
@@ -20,6 +20,8 @@ import os
 import sys
 import time
 import logging
+import logging.handlers
+import queue
 import threading
 from pathlib import Path
 
@@ -38,16 +40,30 @@ LOG_DIR = Path(os.environ.get("PROGRAMDATA", "C:\\ProgramData")) / "VibeVoice"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "vibevoice_service.log"
 
+# Logging threads only enqueue records; file/console IO happens on the listener thread
+_log_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+_file_handler = logging.FileHandler(LOG_FILE)
+_file_handler.setFormatter(_log_formatter)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(
+    _log_queue, _file_handler, _stream_handler, respect_handler_level=True
+)
+log_listener.start()
+
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(),
-    ],
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
 )
 logger = logging.getLogger("VibeVoiceService")
 
+# How long a stop waits for the pipe server thread, and the STOP_PENDING hint
+# given to the SCM (the join plus some slack for logging and teardown)
+SERVER_JOIN_TIMEOUT = 10
+STOP_WAIT_HINT_MS = (SERVER_JOIN_TIMEOUT + 5) * 1000
+
 
 class VibeVoiceService(win32serviceutil.ServiceFramework):
     """Windows service for VibeVoice TTS."""
@@ -68,7 +84,7 @@ class VibeVoiceService(win32serviceutil.ServiceFramework):
     def SvcStop(self):
         """Handle service stop request."""
         logger.info("Service stop requested")
-        self.ReportServiceStatus(win32service.SERVICE_STOP_PENDING)
+        self.ReportServiceStatus(win32service.SERVICE_STOP_PENDING, waitHint=STOP_WAIT_HINT_MS)
         win32event.SetEvent(self.stop_event)
 
         if self.server:
@@ -83,15 +99,16 @@ class VibeVoiceService(win32serviceutil.ServiceFramework):
         )
 
         logger.info("VibeVoice service starting...")
-        self.main()
+        try:
+            self.main()
+        finally:
+            # Drain queued records to disk before the process goes away
+            log_listener.stop()
 
     def main(self):
         """Main service logic."""
         try:
-            # Change to demo directory for imports
-            os.chdir(Path(__file__).parent.parent / "demo")
-
-            # Import the pipe server
+            # Import the pipe server (demo/ is already on sys.path)
             from sapi_pipe_server import SAPIPipeServer
 
             # Configuration
@@ -128,11 +145,15 @@ class VibeVoiceService(win32serviceutil.ServiceFramework):
 
             logger.info("Service is running")
 
-            # Wait for stop event
-            while True:
-                result = win32event.WaitForSingleObject(self.stop_event, 1000)
-                if result == win32event.WAIT_OBJECT_0:
-                    break
+            # Sleep until SvcStop signals; nothing to do in between
+            win32event.WaitForSingleObject(self.stop_event, win32event.INFINITE)
+            # SvcStop may have run before self.server existed; stop() is idempotent
+            self.server.stop()
+
+            # Let the pipe server close its instances before we report stopped
+            self.server_thread.join(timeout=SERVER_JOIN_TIMEOUT)
+            if self.server_thread.is_alive():
+                logger.warning(f"Pipe server did not shut down within {SERVER_JOIN_TIMEOUT}s")
 
             logger.info("Service stopped")
 